@@ -1,16 +1,51 @@
 #!/usr/bin/env python3
-import argparse
+from __future__ import annotations
+
+import bisect
 import csv
+import heapq
 import json
 import os
 import calendar
+import pickle
 import re
+import shlex
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional, Set, Tuple
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Dict, Any, FrozenSet, Iterable, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    import argparse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 DATA_PATH = os.path.expanduser("~/.ralph-habit.json")
 DEFAULT_PROFILE = "default"
-WEEKDAY_ORDER = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+WEEKDAY_ORDER = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+WEEKDAY_INDEX = {label: idx for idx, label in enumerate(WEEKDAY_ORDER)}
+
+
+class WeekdayCounts(namedtuple("WeekdayCounts", WEEKDAY_ORDER)):
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+_ENCODER = json.JSONEncoder(indent=2, sort_keys=True, ensure_ascii=False)
+_CACHE: Dict[str, Any] = {"key": None, "items": None, "pending": None}
+_BATCH: Dict[str, Any] = {"active": False, "items": None, "dirty": False}
+_SIDECAR_VERSION = 1
+_CHECKIN_MEMO_KEYS = ("_checkin_set", "_checkin_ords", "_checkin_mask")
 
 
 def _now_iso() -> str:
@@ -22,11 +57,23 @@ def _today_local() -> date:
 
 
 def _parse_date(value: str) -> date:
-    return datetime.strptime(value, "%Y-%m-%d").date()
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _date_arg(value: str) -> str:
+    try:
+        _parse_date(value)
+    except ValueError:
+        import argparse
+
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (use YYYY-MM-DD)")
+    return value
 
 
-def _format_date(value: date) -> str:
-    return value.isoformat()
+_format_date = date.isoformat
 
 
 def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
@@ -34,17 +81,30 @@ def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
         return None
     try:
         if value.endswith("Z"):
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return datetime.fromisoformat(value[:-1] + "+00:00")
         return datetime.fromisoformat(value)
     except ValueError:
         return None
 
 
+def _is_sorted_unique(values: List[Any]) -> bool:
+    if not all(isinstance(value, str) for value in values):
+        return False
+    return all(prev < value for prev, value in zip(values, values[1:]))
+
+
 def _normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(item, dict):
         return {}
-    if "checkins" not in item or not isinstance(item.get("checkins"), list):
+    if item.get("_normalized"):
+        return item
+    checkins = item.get("checkins")
+    if not isinstance(checkins, list):
         item["checkins"] = []
+        _clear_checkin_memos(item)
+    elif not _is_sorted_unique(checkins):
+        item["checkins"] = sorted({v for v in checkins if isinstance(v, str)})
+        _clear_checkin_memos(item)
     if "tags" in item:
         item["tags"] = _clean_tags(item.get("tags"))
     else:
@@ -57,22 +117,146 @@ def _normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
     goal = item.get("goal_per_week")
     if goal is not None and not isinstance(goal, int):
         item["goal_per_week"] = None
+    item["_normalized"] = True
     return item
 
 
-def _load_items() -> List[Dict[str, Any]]:
-    if not os.path.exists(DATA_PATH):
-        return []
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if not isinstance(data, list):
+def _json_loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_items(items: List[Dict[str, Any]]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            items,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    return (_ENCODER.encode(items) + "\n").encode("utf-8")
+
+
+def _storable_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {key: value for key, value in item.items() if not key.startswith("_")}
+        for item in items
+    ]
+
+
+def _clone_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {key: list(value) if isinstance(value, list) else value for key, value in item.items()}
+        for item in items
+    ]
+
+
+def _sidecar_path() -> str:
+    return DATA_PATH + ".cache"
+
+
+def _sidecar_header(st: os.stat_result) -> Dict[str, int]:
+    return {"version": _SIDECAR_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _read_sidecar(st: os.stat_result) -> Optional[List[Dict[str, Any]]]:
+    try:
+        with open(_sidecar_path(), "rb") as f:
+            header = pickle.load(f)
+            if header != _sidecar_header(st):
+                return None
+            items = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    return items if isinstance(items, list) else None
+
+
+def _write_sidecar(st: os.stat_result, items: List[Dict[str, Any]]) -> None:
+    tmp_path = _sidecar_path() + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(_sidecar_header(st), f)
+            pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _sidecar_path())
+    except OSError:
+        pass
+
+
+def _flush_sidecar() -> None:
+    pending, _CACHE["pending"] = _CACHE["pending"], None
+    if pending is not None:
+        _write_sidecar(*pending)
+
+
+def _read_items() -> List[Dict[str, Any]]:
+    try:
+        st = os.stat(DATA_PATH)
+    except FileNotFoundError:
         return []
-    return [_normalize_item(i) for i in data if isinstance(i, dict)]
+    key = (DATA_PATH, st.st_mtime_ns, st.st_size)
+    if _CACHE["key"] == key:
+        return _clone_items(_CACHE["items"])
+    items = _read_sidecar(st)
+    if items is None:
+        with open(DATA_PATH, "rb") as f:
+            data = _json_loads(f.read())
+        if not isinstance(data, list):
+            items = []
+        else:
+            items = [_normalize_item(i) for i in data if isinstance(i, dict)]
+        _CACHE["pending"] = (st, items)
+    _CACHE["key"] = key
+    _CACHE["items"] = items
+    return _clone_items(items)
+
+
+def _load_items() -> List[Dict[str, Any]]:
+    if not _BATCH["active"]:
+        return _read_items()
+    if _BATCH["items"] is None:
+        _BATCH["items"] = _read_items()
+    return _BATCH["items"]
 
 
 def _save_items(items: List[Dict[str, Any]]) -> None:
-    with open(DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(items, f, indent=2, sort_keys=True)
+    if _BATCH["active"]:
+        _BATCH["items"] = items
+        _BATCH["dirty"] = True
+        return
+    _CACHE.update(key=None, items=None, pending=None)
+    payload = _dumps_items(_storable_items(items))
+    tmp_path = DATA_PATH + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, DATA_PATH)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    try:
+        os.remove(_sidecar_path())
+    except OSError:
+        pass
+
+
+@contextmanager
+def _batched_writes():
+    result = {"saved": False}
+    _BATCH.update(active=True, items=None, dirty=False)
+    try:
+        yield result
+    except BaseException:
+        _BATCH.update(active=False, items=None, dirty=False)
+        raise
+    items, dirty = _BATCH["items"], _BATCH["dirty"]
+    _BATCH.update(active=False, items=None, dirty=False)
+    if dirty:
+        _save_items(items)
+        result["saved"] = True
 
 
 def _next_id(items: List[Dict[str, Any]]) -> int:
@@ -81,66 +265,186 @@ def _next_id(items: List[Dict[str, Any]]) -> int:
     return max(item.get("id", 0) for item in items) + 1
 
 
-def _get_item(items: List[Dict[str, Any]], habit_id: int) -> Optional[Dict[str, Any]]:
+def _index_items(items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    index: Dict[int, Dict[str, Any]] = {}
+    for item in items:
+        item_id = item.get("id")
+        if isinstance(item_id, int) and item_id not in index:
+            index[item_id] = item
+    return index
+
+
+def _get_item(
+    items: List[Dict[str, Any]],
+    habit_id: int,
+    index: Optional[Dict[int, Dict[str, Any]]] = None,
+) -> Optional[Dict[str, Any]]:
+    if index is not None:
+        return index.get(habit_id)
     for item in items:
         if item.get("id") == habit_id:
             return item
     return None
 
 
-def _get_checkin_set(item: Dict[str, Any]) -> Set[str]:
+def _get_checkin_set(item: Dict[str, Any]) -> FrozenSet[str]:
+    cached = item.get("_checkin_set")
+    if cached is not None:
+        return cached
     raw = item.get("checkins", [])
-    if not isinstance(raw, list):
-        return set()
-    return {v for v in raw if isinstance(v, str)}
+    if isinstance(raw, list):
+        checkins = frozenset(v for v in raw if isinstance(v, str))
+    else:
+        checkins = frozenset()
+    item["_checkin_set"] = checkins
+    return checkins
+
 
+def _get_checkin_ordinals(item: Dict[str, Any]) -> FrozenSet[int]:
+    cached = item.get("_checkin_ords")
+    if cached is not None:
+        return cached
+    ordinals = _normalize_checkins(_get_checkin_set(item))
+    item["_checkin_ords"] = ordinals
+    return ordinals
 
-def _touch_item(item: Dict[str, Any]) -> None:
-    item["updated_at"] = _now_iso()
 
+def _get_checkin_mask(item: Dict[str, Any]) -> Tuple[int, int]:
+    cached = item.get("_checkin_mask")
+    if cached is not None:
+        return cached
+    mask = _ordinal_mask(_get_checkin_ordinals(item))
+    item["_checkin_mask"] = mask
+    return mask
 
-def _compute_streaks(checkins: Set[str], today: date) -> Dict[str, int]:
-    dates = sorted(_parse_date(d) for d in checkins)
-    if not dates:
+
+def _clear_checkin_memos(item: Dict[str, Any]) -> None:
+    for key in _CHECKIN_MEMO_KEYS:
+        item.pop(key, None)
+
+
+def _set_checkins(item: Dict[str, Any], checkins: Set[str]) -> None:
+    item["checkins"] = sorted(checkins)
+    _clear_checkin_memos(item)
+
+
+def _add_checkins(item: Dict[str, Any], date_keys: Iterable[str]) -> List[str]:
+    existing = _get_checkin_set(item)
+    new_keys = sorted({key for key in date_keys if key not in existing})
+    if not new_keys:
+        return []
+    if len(new_keys) == 1:
+        bisect.insort(item["checkins"], new_keys[0])
+    else:
+        item["checkins"] = list(heapq.merge(item["checkins"], new_keys))
+    _clear_checkin_memos(item)
+    return new_keys
+
+
+def _remove_checkins(item: Dict[str, Any], date_keys: Iterable[str]) -> List[str]:
+    existing = _get_checkin_set(item)
+    removed = sorted({key for key in date_keys if key in existing})
+    if not removed:
+        return []
+    checkins = item["checkins"]
+    for key in removed:
+        del checkins[bisect.bisect_left(checkins, key)]
+    _clear_checkin_memos(item)
+    return removed
+
+
+def _last_checkin_key(item: Dict[str, Any]) -> Optional[str]:
+    checkins = item.get("checkins")
+    return checkins[-1] if checkins else None
+
+
+def _touch_item(item: Dict[str, Any], now: Optional[str] = None) -> None:
+    item["updated_at"] = now or _now_iso()
+
+
+@lru_cache(maxsize=4096)
+def _iso_to_ordinal(value: str) -> Optional[int]:
+    try:
+        return _parse_date(value).toordinal()
+    except ValueError:
+        return None
+
+
+def _normalize_checkins(checkins: Iterable[str]) -> FrozenSet[int]:
+    ordinals = frozenset(map(_iso_to_ordinal, checkins))
+    if None in ordinals:
+        return ordinals - {None}
+    return ordinals
+
+
+def _ordinal_mask(ordinals: FrozenSet[int]) -> Tuple[int, int]:
+    if not ordinals:
+        return 0, 0
+    base = min(ordinals)
+    buf = bytearray((max(ordinals) - base) // 8 + 1)
+    for value in ordinals:
+        offset = value - base
+        buf[offset >> 3] |= 1 << (offset & 7)
+    return base, int.from_bytes(buf, "little")
+
+
+def _window_mask(base: int, mask: int, start_ord: int, days: int) -> int:
+    if not mask or days <= 0:
+        return 0
+    shift = start_ord - base
+    bits = mask >> shift if shift >= 0 else mask << -shift
+    return bits & ((1 << days) - 1)
+
+
+def _mask_range_count(base: int, mask: int, start_ord: int, end_ord: int) -> int:
+    return bin(_window_mask(base, mask, start_ord, end_ord - start_ord + 1)).count("1")
+
+
+def _streaks_from_mask(base: int, mask: int, today_ord: int) -> Dict[str, int]:
+    if not mask:
         return {"current": 0, "longest": 0}
 
-    longest = 1
-    current_run = 1
-    for idx in range(1, len(dates)):
-        if dates[idx] == dates[idx - 1] + timedelta(days=1):
-            current_run += 1
-        else:
-            longest = max(longest, current_run)
-            current_run = 1
-    longest = max(longest, current_run)
+    longest = 0
+    runs = mask
+    while runs:
+        runs &= runs >> 1
+        longest += 1
 
     current = 0
-    cursor = today
-    while _format_date(cursor) in checkins:
-        current += 1
-        cursor -= timedelta(days=1)
+    offset = today_ord - base
+    if offset >= 0 and (mask >> offset) & 1:
+        window = (1 << (offset + 1)) - 1
+        gaps = ~mask & window
+        current = offset + 1 if not gaps else offset - gaps.bit_length() + 1
 
     return {"current": current, "longest": longest}
 
 
-def _window_dates(end_date: date, days: int) -> List[date]:
-    return [end_date - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+def _item_streaks(item: Dict[str, Any], today_ord: int) -> Dict[str, int]:
+    base, mask = _get_checkin_mask(item)
+    return _streaks_from_mask(base, mask, today_ord)
+
+
+@lru_cache(maxsize=64)
+def _window_dates(end_date: date, days: int) -> Tuple[date, ...]:
+    return tuple(map(date.fromordinal, _window_ordinals(end_date.toordinal(), days)))
 
 
-def _count_window_checkins(checkins: Set[str], end_date: date, days: int) -> int:
-    window = _window_dates(end_date, days)
-    return sum(1 for day in window if _format_date(day) in checkins)
+def _window_ordinals(end_ord: int, days: int) -> range:
+    return range(end_ord - days + 1, end_ord + 1)
+
+
+def _count_range_checkins(item: Dict[str, Any], start_ord: int, end_ord: int) -> int:
+    base, mask = _get_checkin_mask(item)
+    return _mask_range_count(base, mask, start_ord, end_ord)
 
 
 def _date_range(start_date: date, end_date: date) -> List[date]:
-    if end_date < start_date:
-        return []
-    span = (end_date - start_date).days
-    return [start_date + timedelta(days=offset) for offset in range(span + 1)]
+    return list(map(date.fromordinal, range(start_date.toordinal(), end_date.toordinal() + 1)))
 
 
 def _weekday_index(label: str) -> int:
-    return WEEKDAY_ORDER.index(label)
+    return WEEKDAY_INDEX[label]
 
 
 def _weekday_key(value: date) -> str:
@@ -163,7 +467,7 @@ def _clean_target_days(value: Any) -> List[str]:
         label = entry.strip().lower()
         if len(label) >= 3:
             label = label[:3]
-        if label in WEEKDAY_ORDER:
+        if label in WEEKDAY_INDEX:
             normalized.add(label)
     return [label for label in WEEKDAY_ORDER if label in normalized]
 
@@ -233,10 +537,9 @@ def _month_weeks(target_date: date, week_start: str) -> List[List[date]]:
     return cal.monthdatescalendar(target_date.year, target_date.month)
 
 
-def _last_checkin_date(checkins: Set[str]) -> Optional[date]:
-    if not checkins:
-        return None
-    return max(_parse_date(value) for value in checkins)
+def _last_checkin_date(item: Dict[str, Any]) -> Optional[date]:
+    base, mask = _get_checkin_mask(item)
+    return date.fromordinal(base + mask.bit_length() - 1) if mask else None
 
 
 def _days_since(target_date: date, last_date: Optional[date]) -> Optional[int]:
@@ -245,20 +548,25 @@ def _days_since(target_date: date, last_date: Optional[date]) -> Optional[int]:
     return (target_date - last_date).days
 
 
-def _resolve_dates(args: argparse.Namespace) -> Optional[List[date]]:
+def _emit(lines: List[str]) -> None:
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _resolve_dates(args: argparse.Namespace) -> Optional[List[Tuple[date, str]]]:
     if args.date and (args.start or args.end):
         print("Use either --date or --start/--end, not both.")
         return None
     if args.start or args.end:
-        start_date = _parse_date(args.start) if args.start else _parse_date(args.end)
-        end_date = _parse_date(args.end) if args.end else start_date
-        dates = _date_range(start_date, end_date)
+        start_date = _parse_date(args.start) if args.start else None
+        end_date = _parse_date(args.end) if args.end else None
+        dates = _date_range(start_date or end_date, end_date or start_date)
         if not dates:
             print("End date must be on or after start date.")
             return None
-        return dates
+        return [(day, day.isoformat()) for day in dates]
     target_date = _today_local() if args.date is None else _parse_date(args.date)
-    return [target_date]
+    return [(target_date, target_date.isoformat())]
 
 
 def _db_profile() -> str:
@@ -282,6 +590,14 @@ def _get_db_connection():
     return psycopg.connect(db_url)
 
 
+def _use_fast_json(conn) -> None:
+    if orjson is None:
+        return
+    from psycopg.types.json import set_json_dumps
+
+    set_json_dumps(orjson.dumps, context=conn)
+
+
 def _ensure_table(cursor) -> None:
     cursor.execute(
         """
@@ -308,13 +624,13 @@ def _ensure_table(cursor) -> None:
     cursor.execute("ALTER TABLE ralph_habit_items ADD COLUMN IF NOT EXISTS tags JSONB")
 
 
-def _local_item_payload(item: Dict[str, Any]) -> Dict[str, Any]:
+def _local_item_payload(item: Dict[str, Any], now: Optional[str] = None) -> Dict[str, Any]:
     payload = dict(item)
     if not payload.get("created_at"):
-        payload["created_at"] = _now_iso()
+        payload["created_at"] = now or _now_iso()
     if not payload.get("updated_at"):
         payload["updated_at"] = payload["created_at"]
-    payload["checkins"] = sorted(_get_checkin_set(payload))
+    payload["checkins"] = list(payload.get("checkins") or [])
     payload["done"] = bool(payload.get("done"))
     goal = payload.get("goal_per_week")
     payload["goal_per_week"] = goal if isinstance(goal, int) else None
@@ -364,10 +680,9 @@ def _parse_checkins(raw: str) -> List[str]:
     valid: List[str] = []
     for part in parts:
         try:
-            _parse_date(part)
+            valid.append(_format_date(_parse_date(part)))
         except ValueError:
             continue
-        valid.append(part)
     return sorted(set(valid))
 
 
@@ -412,12 +727,6 @@ def _short_list(values: List[str], limit: int) -> str:
     return f"{', '.join(values[:limit])} +{remainder} more"
 
 
-def _scheduled_window(target_days: List[str], window: List[date]) -> List[date]:
-    if not target_days:
-        return window
-    return [day for day in window if _weekday_key(day) in target_days]
-
-
 def _parse_windows(raw: str) -> List[int]:
     if not raw:
         return []
@@ -442,58 +751,77 @@ def _parse_windows(raw: str) -> List[int]:
 
 
 def _window_schedule_stats(
-    checkins: Set[str],
+    item: Dict[str, Any],
     end_date: date,
     days: int,
     target_days: List[str],
 ) -> Tuple[int, int]:
-    window = _window_dates(end_date, days)
-    scheduled = _scheduled_window(target_days, window)
-    expected = len(scheduled)
+    start_ord = end_date.toordinal() - days + 1
+    base, mask = _get_checkin_mask(item)
+    scheduled = _schedule_window_bits(start_ord, days, target_days)
+    expected = bin(scheduled).count("1")
     if expected == 0:
         return 0, 0
-    actual = sum(1 for day in scheduled if _format_date(day) in checkins)
+    actual = bin(_window_mask(base, mask, start_ord, days) & scheduled).count("1")
     return actual, expected
 
 
-def _weekday_occurrences(window: List[date]) -> Dict[str, int]:
-    counts = {label: 0 for label in WEEKDAY_ORDER}
-    for day in window:
-        counts[_weekday_key(day)] += 1
-    return counts
+def _schedule_mask(target_days: List[str]) -> int:
+    if not target_days:
+        return 0x7F
+    schedule = 0
+    for label in target_days:
+        idx = WEEKDAY_INDEX.get(label)
+        if idx is not None:
+            schedule |= 1 << idx
+    return schedule
+
+
+@lru_cache(maxsize=64)
+def _every_week(days: int) -> int:
+    return ((1 << (7 * (days // 7 + 1))) - 1) // 0x7F
+
 
+@lru_cache(maxsize=64)
+def _weekday_lanes(first_weekday: int, days: int) -> Tuple[int, ...]:
+    every_week = _every_week(days)
+    window = (1 << days) - 1
+    return tuple(every_week << ((idx - first_weekday) % 7) & window for idx in range(7))
 
-def _weekday_checkins(window: List[date], checkins: Set[str]) -> Dict[str, int]:
-    counts = {label: 0 for label in WEEKDAY_ORDER}
-    for day in window:
-        if _format_date(day) in checkins:
-            counts[_weekday_key(day)] += 1
-    return counts
 
+def _schedule_window_bits(start_ord: int, days: int, target_days: List[str]) -> int:
+    if days <= 0:
+        return 0
+    schedule = _schedule_mask(target_days)
+    first_weekday = (start_ord + 6) % 7
+    aligned = ((schedule >> first_weekday) | (schedule << (7 - first_weekday))) & 0x7F
+    return aligned * _every_week(days) & ((1 << days) - 1)
 
-def _weekday_summary(
-    window: List[date],
-    checkins: Set[str],
+
+def _weekday_summary_mask(
+    start_ord: int,
+    days: int,
+    mask: int,
     target_days: List[str],
-) -> Tuple[Dict[str, int], Dict[str, int], int, int]:
-    occurrences = _weekday_occurrences(window)
-    actual_counts = _weekday_checkins(window, checkins)
-    if target_days:
-        expected_counts = {
-            label: occurrences[label] if label in target_days else 0
-            for label in WEEKDAY_ORDER
-        }
-    else:
-        expected_counts = occurrences
-    total_actual = sum(actual_counts.values())
-    total_expected = sum(expected_counts.values())
-    return actual_counts, expected_counts, total_actual, total_expected
+) -> Tuple[WeekdayCounts, WeekdayCounts, int, int]:
+    days = max(days, 0)
+    full_weeks, remainder = divmod(days, 7)
+    first_weekday = (start_ord + 6) % 7
+    schedule = _schedule_mask(target_days)
+    actual_counts = WeekdayCounts._make(
+        bin(mask & lane).count("1") for lane in _weekday_lanes(first_weekday, days)
+    )
+    expected_counts = WeekdayCounts._make(
+        full_weeks + ((idx - first_weekday) % 7 < remainder) if schedule >> idx & 1 else 0
+        for idx in range(7)
+    )
+    return actual_counts, expected_counts, sum(actual_counts), sum(expected_counts)
 
 
 def _streak_row(item: Dict[str, Any], target_date: date) -> Dict[str, Any]:
     checkins = _get_checkin_set(item)
-    last_date = _last_checkin_date(checkins)
-    streaks = _compute_streaks(checkins, target_date) if checkins else {"current": 0, "longest": 0}
+    last_date = _last_checkin_date(item)
+    streaks = _item_streaks(item, target_date.toordinal())
     days_since = _days_since(target_date, last_date)
     return {
         "id": item.get("id", 0),
@@ -519,11 +847,12 @@ def _streak_sort_key(row: Dict[str, Any], mode: str) -> Tuple[Any, ...]:
 
 def cmd_add(args: argparse.Namespace) -> None:
     items = _load_items()
+    now = _now_iso()
     item = {
         "id": _next_id(items),
         "title": args.title.strip(),
-        "created_at": _now_iso(),
-        "updated_at": _now_iso(),
+        "created_at": now,
+        "updated_at": now,
         "done": False,
         "checkins": [],
         "note": None,
@@ -535,24 +864,25 @@ def cmd_add(args: argparse.Namespace) -> None:
 
 
 def cmd_list(args: argparse.Namespace) -> None:
-    items = _load_items()
-    if not args.all:
-        items = [i for i in items if not i.get("done")]
-    if not items:
-        print("No habits yet.")
-        return
-    for item in items:
-        status = "✓" if item.get("done") else "·"
-        checkins = _get_checkin_set(item)
-        last_checkin = max(checkins) if checkins else "-"
+    lines: List[str] = []
+    for item in _load_items():
+        done = item.get("done")
+        if done and not args.all:
+            continue
+        status = "✓" if done else "·"
+        last_checkin = _last_checkin_key(item) or "-"
         goal = item.get("goal_per_week")
         goal_label = f"goal: {goal}/wk" if isinstance(goal, int) else "goal: -"
         note_label = _note_label(item.get("note"))
         target_label = _target_days_label(_clean_target_days(item.get("target_days")))
-        print(
+        lines.append(
             f"{item['id']:>3} {status} {item.get('title', '')} "
             f"({goal_label}, {note_label}, {target_label}, last: {last_checkin})"
         )
+    if not lines:
+        print("No habits yet.")
+        return
+    _emit(lines)
 
 
 def cmd_done(args: argparse.Namespace) -> None:
@@ -562,9 +892,10 @@ def cmd_done(args: argparse.Namespace) -> None:
         if item.get("done"):
             print(f"Habit #{args.id} is already done.")
             return
+        now = _now_iso()
         item["done"] = True
-        item["done_at"] = _now_iso()
-        _touch_item(item)
+        item["done_at"] = now
+        _touch_item(item, now)
         _save_items(items)
         print(f"Completed habit #{args.id}: {item.get('title', '')}")
         return
@@ -602,6 +933,9 @@ def cmd_rename(args: argparse.Namespace) -> None:
     item = _get_item(items, args.id)
     if item:
         old_title = item.get("title", "")
+        if args.title.strip() == old_title:
+            print(f"Habit #{args.id} already has that title.")
+            return
         item["title"] = args.title.strip()
         _touch_item(item)
         _save_items(items)
@@ -622,25 +956,18 @@ def cmd_checkin(args: argparse.Namespace) -> None:
     dates = _resolve_dates(args)
     if dates is None:
         return
-    checkins = _get_checkin_set(item)
-    added = 0
-    for target_date in dates:
-        date_key = _format_date(target_date)
-        if date_key not in checkins:
-            checkins.add(date_key)
-            added += 1
-    item["checkins"] = sorted(checkins)
-    _touch_item(item)
-    _save_items(items)
+    added = len(_add_checkins(item, (date_key for _, date_key in dates)))
     if added == 0:
         print(f"No new check-ins added for habit #{args.id}.")
         return
+    _touch_item(item)
+    _save_items(items)
     if len(dates) == 1:
-        print(f"Checked in habit #{args.id}: {item.get('title', '')} ({_format_date(dates[0])})")
+        print(f"Checked in habit #{args.id}: {item.get('title', '')} ({dates[0][1]})")
         return
     print(
         f"Checked in habit #{args.id}: {item.get('title', '')} "
-        f"({added} new from {_format_date(dates[0])} to {_format_date(dates[-1])})"
+        f"({added} new from {dates[0][1]} to {dates[-1][1]})"
     )
 
 
@@ -656,55 +983,47 @@ def cmd_checkin_all(args: argparse.Namespace) -> None:
     if not active_items:
         print("No active habits to check in.")
         return
-    date_summaries = {day: {"added": 0, "titles": []} for day in dates}
+    date_index = {date_key: idx for idx, (_, date_key) in enumerate(dates)}
+    added_counts = [0] * len(dates)
+    added_titles: List[List[str]] = [[] for _ in dates]
     total_added = 0
+    now = _now_iso()
 
     for item in active_items:
         title = item.get("title", "")
         target_days = _clean_target_days(item.get("target_days"))
         if not target_days and not args.include_unscheduled:
             continue
-        eligible_dates = []
-        for target_date in dates:
-            if target_days:
-                if _weekday_key(target_date) not in target_days:
-                    continue
-            eligible_dates.append(target_date)
-        if not eligible_dates:
+        eligible_keys = (
+            date_key
+            for target_date, date_key in dates
+            if not target_days or _weekday_key(target_date) in target_days
+        )
+        new_keys = _add_checkins(item, eligible_keys)
+        if not new_keys:
             continue
-        checkins = _get_checkin_set(item)
-        added_for_item = 0
-        for target_date in eligible_dates:
-            date_key = _format_date(target_date)
-            if date_key in checkins:
-                continue
-            checkins.add(date_key)
-            added_for_item += 1
-            total_added += 1
-            summary = date_summaries[target_date]
-            summary["added"] += 1
+        _touch_item(item, now)
+        total_added += len(new_keys)
+        for date_key in new_keys:
+            idx = date_index[date_key]
+            added_counts[idx] += 1
             if title:
-                summary["titles"].append(title)
-        if added_for_item:
-            item["checkins"] = sorted(checkins)
-            _touch_item(item)
+                added_titles[idx].append(title)
 
     if total_added == 0:
         print("No new check-ins added.")
         return
     _save_items(items)
 
-    for target_date in dates:
-        summary = date_summaries[target_date]
-        date_key = _format_date(target_date)
-        if summary["added"] == 0:
+    for (_, date_key), added, titles in zip(dates, added_counts, added_titles):
+        if added == 0:
             print(f"{date_key} | 0 habits checked in")
             continue
-        label = _short_list(summary["titles"], args.limit)
+        label = _short_list(titles, args.limit)
         if label:
-            print(f"{date_key} | {summary['added']} habits checked in | {label}")
+            print(f"{date_key} | {added} habits checked in | {label}")
         else:
-            print(f"{date_key} | {summary['added']} habits checked in")
+            print(f"{date_key} | {added} habits checked in")
     print(f"Total new check-ins: {total_added}")
 
 
@@ -717,25 +1036,18 @@ def cmd_uncheck(args: argparse.Namespace) -> None:
     dates = _resolve_dates(args)
     if dates is None:
         return
-    checkins = _get_checkin_set(item)
-    removed = 0
-    for target_date in dates:
-        date_key = _format_date(target_date)
-        if date_key in checkins:
-            checkins.remove(date_key)
-            removed += 1
-    item["checkins"] = sorted(checkins)
-    _touch_item(item)
-    _save_items(items)
+    removed = len(_remove_checkins(item, (date_key for _, date_key in dates)))
     if removed == 0:
         print(f"No check-ins removed for habit #{args.id}.")
         return
+    _touch_item(item)
+    _save_items(items)
     if len(dates) == 1:
-        print(f"Removed check-in for habit #{args.id} on {_format_date(dates[0])}.")
+        print(f"Removed check-in for habit #{args.id} on {dates[0][1]}.")
         return
     print(
         f"Removed {removed} check-ins for habit #{args.id} "
-        f"from {_format_date(dates[0])} to {_format_date(dates[-1])}."
+        f"from {dates[0][1]} to {dates[-1][1]}."
     )
 
 
@@ -750,7 +1062,7 @@ def cmd_streak(args: argparse.Namespace) -> None:
         print("No check-ins yet.")
         return
     today = _today_local() if args.date is None else _parse_date(args.date)
-    streaks = _compute_streaks(checkins, today)
+    streaks = _item_streaks(item, today.toordinal())
     print(f"Current streak: {streaks['current']} day(s)")
     print(f"Longest streak: {streaks['longest']} day(s)")
     print(f"Total check-ins: {len(checkins)}")
@@ -785,18 +1097,26 @@ def cmd_streaks(args: argparse.Namespace) -> None:
 def cmd_stats(_: argparse.Namespace) -> None:
     items = _load_items()
     total = len(items)
-    completed = sum(1 for item in items if item.get("done"))
-    active = total - completed
     if total == 0:
         print("No habits yet.")
         return
-    print(f"Total: {total}")
-    print(f"Active: {active}")
-    print(f"Completed: {completed}")
-    goals = sum(1 for item in items if isinstance(item.get("goal_per_week"), int))
-    print(f"With goals: {goals}")
-    total_checkins = sum(len(_get_checkin_set(item)) for item in items)
-    print(f"Check-ins: {total_checkins}")
+    completed = goals = total_checkins = 0
+    for item in items:
+        if item.get("done"):
+            completed += 1
+        if isinstance(item.get("goal_per_week"), int):
+            goals += 1
+        total_checkins += len(item["checkins"])
+    active = total - completed
+    _emit(
+        [
+            f"Total: {total}",
+            f"Active: {active}",
+            f"Completed: {completed}",
+            f"With goals: {goals}",
+            f"Check-ins: {total_checkins}",
+        ]
+    )
 
 
 def cmd_report(args: argparse.Namespace) -> None:
@@ -810,26 +1130,26 @@ def cmd_report(args: argparse.Namespace) -> None:
         print("Days must be at least 1.")
         return
     end_date = _today_local() if args.date is None else _parse_date(args.date)
-    window = _window_dates(end_date, args.days)
-    window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
+    window = _window_ordinals(end_date.toordinal(), args.days)
+    start_ord, end_ord = window[0], window[-1]
+    window_labels = f"{_format_date(date.fromordinal(start_ord))} → {_format_date(end_date)}"
     total_possible = len(items) * args.days
     total_checkins = 0
 
-    print(f"Report window: {window_labels} ({args.days} days)")
+    lines = [f"Report window: {window_labels} ({args.days} days)"]
     for item in items:
-        checkins = _get_checkin_set(item)
-        count = _count_window_checkins(checkins, end_date, args.days)
+        count = _count_range_checkins(item, start_ord, end_ord)
         total_checkins += count
         rate = (count / args.days) * 100
-        last_checkin = max(checkins) if checkins else "-"
-        streaks = _compute_streaks(checkins, end_date) if checkins else {"current": 0, "longest": 0}
+        last_checkin = _last_checkin_key(item) or "-"
+        streaks = _item_streaks(item, end_ord)
         goal = item.get("goal_per_week")
         if isinstance(goal, int):
             expected = (goal * args.days) / 7
             goal_label = f"goal {goal}/wk pace {count}/{expected:.1f}"
         else:
             goal_label = "goal -"
-        print(
+        lines.append(
             f"{item['id']:>3} {item.get('title', '')} | "
             f"{count}/{args.days} ({rate:.0f}%) | "
             f"current {streaks['current']} | "
@@ -839,7 +1159,8 @@ def cmd_report(args: argparse.Namespace) -> None:
         )
 
     overall_rate = (total_checkins / total_possible) * 100 if total_possible else 0
-    print(f"Overall check-ins: {total_checkins}/{total_possible} ({overall_rate:.0f}%)")
+    lines.append(f"Overall check-ins: {total_checkins}/{total_possible} ({overall_rate:.0f}%)")
+    _emit(lines)
 
 
 def cmd_history(args: argparse.Namespace) -> None:
@@ -852,14 +1173,15 @@ def cmd_history(args: argparse.Namespace) -> None:
         print("Days must be at least 1.")
         return
     end_date = _today_local() if args.date is None else _parse_date(args.date)
-    window = _window_dates(end_date, args.days)
-    checkins = _get_checkin_set(item)
-    window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
-    print(f"History: {item.get('title', '')} ({window_labels})")
-    for day in window:
-        day_key = _format_date(day)
-        mark = "✓" if day_key in checkins else "·"
-        print(f"{day_key} {mark}")
+    window = _window_ordinals(end_date.toordinal(), args.days)
+    base, mask = _get_checkin_mask(item)
+    hits = _window_mask(base, mask, window[0], args.days)
+    window_labels = f"{_format_date(date.fromordinal(window[0]))} → {_format_date(end_date)}"
+    lines = [f"History: {item.get('title', '')} ({window_labels})"]
+    for offset, day_ord in enumerate(window):
+        mark = "✓" if hits >> offset & 1 else "·"
+        lines.append(f"{date.fromordinal(day_ord).isoformat()} {mark}")
+    _emit(lines)
 
 
 def cmd_today(args: argparse.Namespace) -> None:
@@ -871,7 +1193,6 @@ def cmd_today(args: argparse.Namespace) -> None:
         return
     target_date = _today_local() if args.date is None else _parse_date(args.date)
     start_date, end_date = _week_window(target_date, args.week_start)
-    window = _date_range(start_date, end_date)
     elapsed_days = (target_date - start_date).days + 1
     window_labels = f"{_format_date(start_date)} → {_format_date(end_date)}"
     due_count = 0
@@ -884,9 +1205,9 @@ def cmd_today(args: argparse.Namespace) -> None:
         scheduled = not target_days or _weekday_key(target_date) in target_days
         if scheduled and not did_today:
             due_count += 1
-        last_checkin = max(checkins) if checkins else "-"
-        streaks = _compute_streaks(checkins, target_date) if checkins else {"current": 0, "longest": 0}
-        count_week = sum(1 for day in window if _format_date(day) in checkins)
+        last_checkin = _last_checkin_key(item) or "-"
+        streaks = _item_streaks(item, target_date.toordinal())
+        count_week = _count_range_checkins(item, start_date.toordinal(), end_date.toordinal())
         goal = item.get("goal_per_week")
         if isinstance(goal, int):
             expected = (goal * elapsed_days) / 7
@@ -917,44 +1238,67 @@ def cmd_sync(_: argparse.Namespace) -> None:
     conn = _get_db_connection()
     if conn is None:
         return
+    _use_fast_json(conn)
     profile = _db_profile()
+    unique_items = _index_items(items).values()
+    columns = (
+        "profile, id, title, created_at, updated_at, done, done_at, "
+        "goal_per_week, note, target_days, checkins"
+    )
     with conn:
         with conn.cursor() as cursor:
             _ensure_table(cursor)
-            for item in items:
-                payload = _local_item_payload(item)
-                cursor.execute(
-                    """
-                    INSERT INTO ralph_habit_items
-                        (profile, id, title, created_at, updated_at, done, done_at, goal_per_week, note, target_days, checkins)
-                    VALUES (%(profile)s, %(id)s, %(title)s, %(created_at)s, %(updated_at)s, %(done)s, %(done_at)s, %(goal_per_week)s, %(note)s, %(target_days)s::jsonb, %(checkins)s::jsonb)
-                    ON CONFLICT (profile, id) DO UPDATE SET
-                        title = EXCLUDED.title,
-                        created_at = EXCLUDED.created_at,
-                        updated_at = EXCLUDED.updated_at,
-                        done = EXCLUDED.done,
-                        done_at = EXCLUDED.done_at,
-                        goal_per_week = EXCLUDED.goal_per_week,
-                        note = EXCLUDED.note,
-                        target_days = EXCLUDED.target_days,
-                        checkins = EXCLUDED.checkins
-                    """,
-                    {
-                        "profile": profile,
-                        "id": payload.get("id"),
-                        "title": payload.get("title", ""),
-                        "created_at": payload.get("created_at"),
-                        "updated_at": payload.get("updated_at"),
-                        "done": payload.get("done"),
-                        "done_at": payload.get("done_at"),
-                        "goal_per_week": payload.get("goal_per_week"),
-                        "note": payload.get("note"),
-                        "target_days": json.dumps(payload.get("target_days", [])),
-                        "checkins": json.dumps(payload.get("checkins", [])),
-                    },
+            cursor.execute(
+                """
+                CREATE TEMP TABLE ralph_habit_staging
+                    (LIKE ralph_habit_items INCLUDING DEFAULTS) ON COMMIT DROP
+                """
+            )
+            now = _now_iso()
+            with cursor.copy(
+                f"COPY ralph_habit_staging ({columns}) FROM STDIN WITH (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types(
+                    [
+                        "text", "int4", "text", "text", "text", "bool",
+                        "text", "int4", "text", "jsonb", "jsonb",
+                    ]
                 )
+                for item in unique_items:
+                    payload = _local_item_payload(item, now)
+                    copy.write_row(
+                        (
+                            profile,
+                            payload.get("id"),
+                            payload.get("title", ""),
+                            payload.get("created_at"),
+                            payload.get("updated_at"),
+                            payload.get("done"),
+                            payload.get("done_at"),
+                            payload.get("goal_per_week"),
+                            payload.get("note"),
+                            payload.get("target_days", []),
+                            payload.get("checkins", []),
+                        )
+                    )
+            cursor.execute(
+                f"""
+                INSERT INTO ralph_habit_items ({columns})
+                SELECT {columns} FROM ralph_habit_staging
+                ON CONFLICT (profile, id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    created_at = EXCLUDED.created_at,
+                    updated_at = EXCLUDED.updated_at,
+                    done = EXCLUDED.done,
+                    done_at = EXCLUDED.done_at,
+                    goal_per_week = EXCLUDED.goal_per_week,
+                    note = EXCLUDED.note,
+                    target_days = EXCLUDED.target_days,
+                    checkins = EXCLUDED.checkins
+                """
+            )
     conn.close()
-    print(f"Synced {len(items)} habit(s) to profile '{profile}'.")
+    print(f"Synced {len(unique_items)} habit(s) to profile '{profile}'.")
 
 
 def cmd_pull(_: argparse.Namespace) -> None:
@@ -980,7 +1324,7 @@ def cmd_pull(_: argparse.Namespace) -> None:
         print(f"No habits found for profile '{profile}'.")
         return
     items = _load_items()
-    local_by_id = {item.get("id"): item for item in items if isinstance(item.get("id"), int)}
+    local_by_id = _index_items(items)
     merged: List[Dict[str, Any]] = []
     merged_ids: Set[int] = set()
     for row in rows:
@@ -993,47 +1337,38 @@ def cmd_pull(_: argparse.Namespace) -> None:
             "done_at": row[5],
             "goal_per_week": row[6],
             "note": row[7],
-            "target_days": row[8] if isinstance(row[8], list) else json.loads(row[8]) if row[8] else [],
-            "checkins": row[9] if isinstance(row[9], list) else json.loads(row[9]) if row[9] else [],
+            "target_days": row[8] if isinstance(row[8], list) else _json_loads(row[8]) if row[8] else [],
+            "checkins": row[9] if isinstance(row[9], list) else _json_loads(row[9]) if row[9] else [],
         }
         local_item = local_by_id.get(db_item["id"])
+        chosen = db_item
         if local_item:
             local_updated, db_updated = _compare_updated(local_item, db_item)
-            if db_updated and (not local_updated or db_updated > local_updated):
-                merged.append(_normalize_item(db_item))
-            else:
-                merged.append(_normalize_item(local_item))
-            merged_ids.add(db_item["id"])
-        else:
-            merged.append(_normalize_item(db_item))
-            merged_ids.add(db_item["id"])
-    for item_id, local_item in local_by_id.items():
-        if item_id not in merged_ids:
-            merged.append(_normalize_item(local_item))
+            if not db_updated or (local_updated and db_updated <= local_updated):
+                chosen = local_item
+        merged.append(_normalize_item(chosen))
+        merged_ids.add(db_item["id"])
+    merged.extend(
+        _normalize_item(local_item)
+        for item_id, local_item in local_by_id.items()
+        if item_id not in merged_ids
+    )
     _save_items(merged)
     print(f"Pulled {len(rows)} habit(s) from profile '{profile}' into local store.")
 
 
 def cmd_week(args: argparse.Namespace) -> None:
     items = _load_items()
-    if not args.all:
-        items = [i for i in items if not i.get("done")]
-    if not items:
-        print("No habits yet.")
-        return
     target_date = _today_local() if args.date is None else _parse_date(args.date)
     start_date, end_date = _week_window(target_date, args.week_start)
-    window = _date_range(start_date, end_date)
     window_labels = f"{_format_date(start_date)} → {_format_date(end_date)}"
     elapsed_days = (target_date - start_date).days + 1
     remaining_days = 7 - elapsed_days
-    print(
-        f"Week view ({args.week_start} start): {window_labels} "
-        f"(day {elapsed_days} of 7)"
-    )
+    lines = [f"Week view ({args.week_start} start): {window_labels} (day {elapsed_days} of 7)"]
     for item in items:
-        checkins = _get_checkin_set(item)
-        count = sum(1 for day in window if _format_date(day) in checkins)
+        if item.get("done") and not args.all:
+            continue
+        count = _count_range_checkins(item, start_date.toordinal(), end_date.toordinal())
         goal = item.get("goal_per_week")
         if isinstance(goal, int):
             remaining = max(goal - count, 0)
@@ -1045,7 +1380,11 @@ def cmd_week(args: argparse.Namespace) -> None:
             goal_label = f"{count}/{goal} {needed}"
         else:
             goal_label = f"{count}/-"
-        print(f"{item['id']:>3} {item.get('title', '')} | {goal_label}")
+        lines.append(f"{item['id']:>3} {item.get('title', '')} | {goal_label}")
+    if len(lines) == 1:
+        print("No habits yet.")
+        return
+    _emit(lines)
 
 
 def cmd_nudge(args: argparse.Namespace) -> None:
@@ -1060,17 +1399,15 @@ def cmd_nudge(args: argparse.Namespace) -> None:
         return
     target_date = _today_local() if args.date is None else _parse_date(args.date)
     start_date, end_date = _week_window(target_date, args.week_start)
-    window = _date_range(start_date, end_date)
     elapsed_days = (target_date - start_date).days + 1
     remaining_days = 7 - elapsed_days
     nudges: List[str] = []
     for item in items:
-        checkins = _get_checkin_set(item)
-        last_date = _last_checkin_date(checkins)
+        last_date = _last_checkin_date(item)
         days_since = (target_date - last_date).days if last_date else None
         stale = last_date is None or (days_since is not None and days_since >= args.days)
 
-        count = sum(1 for day in window if _format_date(day) in checkins)
+        count = _count_range_checkins(item, start_date.toordinal(), end_date.toordinal())
         goal = item.get("goal_per_week")
         behind_pace = False
         impossible = False
@@ -1107,12 +1444,12 @@ def cmd_nudge(args: argparse.Namespace) -> None:
     if not nudges:
         print("All habits are on track.")
         return
-    print(
+    nudges.insert(
+        0,
         f"Nudge view ({args.week_start} start, stale >= {args.days}d): "
-        f"{_format_date(start_date)} → {_format_date(end_date)}"
+        f"{_format_date(start_date)} → {_format_date(end_date)}",
     )
-    for line in nudges:
-        print(line)
+    _emit(nudges)
 
 
 def cmd_review(args: argparse.Namespace) -> None:
@@ -1133,26 +1470,24 @@ def cmd_review(args: argparse.Namespace) -> None:
     window = _window_dates(end_date, args.days)
     window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
     week_start, week_end = _week_window(end_date, args.week_start)
-    week_window = _date_range(week_start, week_end)
     elapsed_days = (end_date - week_start).days + 1
 
     print(f"Review window: {window_labels} ({args.days} days)")
     print(f"Week window ({args.week_start} start): {_format_date(week_start)} → {_format_date(week_end)}")
 
     for item in items:
-        checkins = _get_checkin_set(item)
-        last_date = _last_checkin_date(checkins)
+        last_date = _last_checkin_date(item)
         days_since = _days_since(end_date, last_date)
         last_label = _format_date(last_date) if last_date else "-"
         since_label = f"{days_since}d" if days_since is not None else "-"
         stale = days_since is None or days_since >= args.stale_days
         stale_label = "stale" if stale else "ok"
 
-        count_window = _count_window_checkins(checkins, end_date, args.days)
+        count_window = _count_range_checkins(item, window[0].toordinal(), end_date.toordinal())
         rate = (count_window / args.days) * 100
-        streaks = _compute_streaks(checkins, end_date) if checkins else {"current": 0, "longest": 0}
+        streaks = _item_streaks(item, end_date.toordinal())
 
-        count_week = sum(1 for day in week_window if _format_date(day) in checkins)
+        count_week = _count_range_checkins(item, week_start.toordinal(), week_end.toordinal())
         goal = item.get("goal_per_week")
         if isinstance(goal, int):
             expected = (goal * elapsed_days) / 7
@@ -1184,22 +1519,25 @@ def cmd_coverage(args: argparse.Namespace) -> None:
     window = _window_dates(end_date, args.days)
     window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
     print(f"Coverage window: {window_labels} ({args.days} days)")
+    window_keys = [day.isoformat() for day in window]
+    window_weekdays = [_weekday_key(day) for day in window]
 
     for item in items:
         checkins = _get_checkin_set(item)
         target_days = _clean_target_days(item.get("target_days"))
-        scheduled_days = _scheduled_window(target_days, window)
-        expected = len(scheduled_days)
+        if target_days:
+            scheduled_keys = [
+                key for key, label in zip(window_keys, window_weekdays) if label in target_days
+            ]
+        else:
+            scheduled_keys = window_keys
+        expected = len(scheduled_keys)
         if expected == 0:
             print(f"{item['id']:>3} {item.get('title', '')} | no scheduled days")
             continue
-        actual = sum(1 for day in scheduled_days if _format_date(day) in checkins)
+        missed_dates = [key for key in scheduled_keys if key not in checkins]
+        actual = expected - len(missed_dates)
         rate = (actual / expected) * 100 if expected else 0
-        missed_dates = [
-            _format_date(day)
-            for day in scheduled_days
-            if _format_date(day) not in checkins
-        ]
         last_missed = missed_dates[-1] if missed_dates else "-"
         if missed_dates:
             recent = missed_dates[-args.limit :] if args.limit > 0 else []
@@ -1228,32 +1566,39 @@ def cmd_timeline(args: argparse.Namespace) -> None:
         print("Days must be at least 1.")
         return
     end_date = _today_local() if args.date is None else _parse_date(args.date)
-    window = _window_dates(end_date, args.days)
-    window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
-    print(f"Timeline: {window_labels} ({args.days} days)")
+    window_keys = [day.isoformat() for day in _window_dates(end_date, args.days)]
+    start_key, end_key = window_keys[0], window_keys[-1]
+    lines = [f"Timeline: {start_key} → {end_key} ({args.days} days)"]
 
     total_habits = len(items)
     total_checkins = 0
-    for day in window:
-        day_key = _format_date(day)
-        checked_titles = []
-        for item in items:
-            checkins = _get_checkin_set(item)
-            if day_key in checkins:
-                checked_titles.append(item.get("title", ""))
-        checked_titles = [title for title in checked_titles if title]
+    day_titles: Dict[str, List[str]] = {key: [] for key in window_keys}
+    for item in items:
+        title = item.get("title", "")
+        if not title:
+            continue
+        checkins = item["checkins"]
+        lo = bisect.bisect_left(checkins, start_key)
+        hi = bisect.bisect_right(checkins, end_key, lo)
+        for key in checkins[lo:hi]:
+            bucket = day_titles.get(key)
+            if bucket is not None:
+                bucket.append(title)
+    for day_key in window_keys:
+        checked_titles = day_titles[day_key]
         count = len(checked_titles)
         total_checkins += count
         rate = (count / total_habits) * 100 if total_habits else 0
         summary = _short_list(checked_titles, args.limit)
         if summary:
-            print(f"{day_key} | {count}/{total_habits} ({rate:.0f}%) | {summary}")
+            lines.append(f"{day_key} | {count}/{total_habits} ({rate:.0f}%) | {summary}")
         else:
-            print(f"{day_key} | {count}/{total_habits} ({rate:.0f}%)")
+            lines.append(f"{day_key} | {count}/{total_habits} ({rate:.0f}%)")
 
     total_possible = total_habits * args.days
     overall_rate = (total_checkins / total_possible) * 100 if total_possible else 0
-    print(f"Overall check-ins: {total_checkins}/{total_possible} ({overall_rate:.0f}%)")
+    lines.append(f"Overall check-ins: {total_checkins}/{total_possible} ({overall_rate:.0f}%)")
+    _emit(lines)
 
 
 def cmd_plan(args: argparse.Namespace) -> None:
@@ -1272,30 +1617,29 @@ def cmd_plan(args: argparse.Namespace) -> None:
     window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
     print(f"Plan: {window_labels} ({args.days} days)")
 
-    prepared = []
+    start_ord = start_date.toordinal()
+    titles: List[str] = []
+    hit_masks: List[int] = []
+    scheduled_masks: List[int] = []
     for item in items:
-        prepared.append(
-            {
-                "title": item.get("title", ""),
-                "checkins": _get_checkin_set(item),
-                "target_days": _clean_target_days(item.get("target_days")),
-            }
+        title = item.get("title", "")
+        if not title:
+            continue
+        base, mask = _get_checkin_mask(item)
+        titles.append(title)
+        hit_masks.append(_window_mask(base, mask, start_ord, args.days))
+        scheduled_masks.append(
+            _schedule_window_bits(start_ord, args.days, _clean_target_days(item.get("target_days")))
         )
 
-    for day in window:
-        day_key = _format_date(day)
-        day_label = _weekday_key(day)
+    for offset, day in enumerate(window):
+        day_key = day.isoformat()
         scheduled_titles: List[str] = []
         checked_count = 0
-        for entry in prepared:
-            target_days = entry["target_days"]
-            if target_days and day_label not in target_days:
-                continue
-            title = entry["title"]
-            if not title:
+        for title, hits, scheduled in zip(titles, hit_masks, scheduled_masks):
+            if not scheduled >> offset & 1:
                 continue
-            did_checkin = day_key in entry["checkins"]
-            if did_checkin:
+            if hits >> offset & 1:
                 checked_count += 1
                 scheduled_titles.append(f"{title}✓")
             else:
@@ -1324,17 +1668,16 @@ def cmd_momentum(args: argparse.Namespace) -> None:
     print(f"Momentum as of {_format_date(end_date)} (windows: {window_label})")
 
     for item in items:
-        checkins = _get_checkin_set(item)
         target_days = _clean_target_days(item.get("target_days"))
         segments = []
         for span in windows:
-            actual, expected = _window_schedule_stats(checkins, end_date, span, target_days)
+            actual, expected = _window_schedule_stats(item, end_date, span, target_days)
             if expected == 0:
                 segments.append(f"{span}d: -")
             else:
                 rate = (actual / expected) * 100
                 segments.append(f"{span}d {actual}/{expected} ({rate:.0f}%)")
-        last_checkin = max(checkins) if checkins else "-"
+        last_checkin = _last_checkin_key(item) or "-"
         print(
             f"{item['id']:>3} {item.get('title', '')} | "
             f"{' | '.join(segments)} | last {last_checkin}"
@@ -1352,19 +1695,20 @@ def cmd_weekday(args: argparse.Namespace) -> None:
         print("Days must be at least 1.")
         return
     end_date = _today_local() if args.date is None else _parse_date(args.date)
-    window = _window_dates(end_date, args.days)
-    window_labels = f"{_format_date(window[0])} → {_format_date(window[-1])}"
+    start_ord = end_date.toordinal() - args.days + 1
+    window_labels = f"{_format_date(date.fromordinal(start_ord))} → {_format_date(end_date)}"
     print(f"Weekday pattern: {window_labels} ({args.days} days)")
 
     for item in items:
-        checkins = _get_checkin_set(item)
+        base, mask = _get_checkin_mask(item)
         target_days = _clean_target_days(item.get("target_days"))
-        actual_counts, expected_counts, total_actual, total_expected = _weekday_summary(
-            window, checkins, target_days
+        actual_counts, expected_counts, total_actual, total_expected = _weekday_summary_mask(
+            start_ord, args.days, _window_mask(base, mask, start_ord, args.days), target_days
         )
-        segments = []
-        for label in WEEKDAY_ORDER:
-            segments.append(f"{label} {actual_counts[label]}/{expected_counts[label]}")
+        segments = [
+            f"{label} {actual}/{expected}"
+            for label, actual, expected in zip(WEEKDAY_ORDER, actual_counts, expected_counts)
+        ]
         print(
             f"{item['id']:>3} {item.get('title', '')} | "
             f"{' | '.join(segments)} | "
@@ -1379,6 +1723,9 @@ def cmd_goal(args: argparse.Namespace) -> None:
         print(f"Habit #{args.id} not found.")
         return
     if args.clear:
+        if item.get("goal_per_week") is None:
+            print(f"Habit #{args.id} has no goal set.")
+            return
         item["goal_per_week"] = None
         _touch_item(item)
         _save_items(items)
@@ -1390,6 +1737,9 @@ def cmd_goal(args: argparse.Namespace) -> None:
     if args.per_week < 1 or args.per_week > 7:
         print("Goal per week must be between 1 and 7.")
         return
+    if item.get("goal_per_week") == args.per_week:
+        print(f"Habit #{args.id} already has a goal of {args.per_week}/week.")
+        return
     item["goal_per_week"] = args.per_week
     _touch_item(item)
     _save_items(items)
@@ -1403,6 +1753,9 @@ def cmd_schedule(args: argparse.Namespace) -> None:
         print(f"Habit #{args.id} not found.")
         return
     if args.clear:
+        if not item.get("target_days"):
+            print(f"Habit #{args.id} has no schedule set.")
+            return
         item["target_days"] = []
         _touch_item(item)
         _save_items(items)
@@ -1417,6 +1770,9 @@ def cmd_schedule(args: argparse.Namespace) -> None:
     if parsed is None:
         print("Provide weekdays like: mon tue wed thu fri sat sun.")
         return
+    if item.get("target_days") == parsed:
+        print(f"Habit #{args.id} already has that schedule.")
+        return
     item["target_days"] = parsed
     _touch_item(item)
     _save_items(items)
@@ -1445,9 +1801,9 @@ def cmd_month(args: argparse.Namespace) -> None:
     checkins = _get_checkin_set(item)
     weeks = _month_weeks(target_date, args.week_start)
     month_label = target_date.strftime("%Y-%m")
-    labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
     start_idx = _weekday_index(args.week_start)
-    ordered_labels = labels[start_idx:] + labels[:start_idx]
+    ordered = WEEKDAY_ORDER[start_idx:] + WEEKDAY_ORDER[:start_idx]
+    ordered_labels = [label.title() for label in ordered]
 
     print(f"Month view ({args.week_start} start): {item.get('title', '')} [{month_label}]")
     print(" ".join(ordered_labels))
@@ -1460,10 +1816,9 @@ def cmd_month(args: argparse.Namespace) -> None:
             if day.month != target_date.month:
                 row.append("   ")
                 continue
-            key = _format_date(day)
-            mark = "✓" if key in checkins else "·"
-            if key in checkins:
-                checkin_count += 1
+            hit = day.isoformat() in checkins
+            checkin_count += hit
+            mark = "✓" if hit else "·"
             row.append(f"{day.day:2d}{mark}")
         print(" ".join(row))
 
@@ -1478,6 +1833,9 @@ def cmd_note(args: argparse.Namespace) -> None:
         print(f"Habit #{args.id} not found.")
         return
     if args.clear:
+        if item.get("note") is None:
+            print(f"Habit #{args.id} has no note set.")
+            return
         item["note"] = None
         _touch_item(item)
         _save_items(items)
@@ -1487,6 +1845,9 @@ def cmd_note(args: argparse.Namespace) -> None:
         print("Provide note text or use --clear.")
         return
     note = args.text.strip()
+    if item.get("note") == note:
+        print(f"Habit #{args.id} already has that note.")
+        return
     item["note"] = note
     _touch_item(item)
     _save_items(items)
@@ -1539,11 +1900,12 @@ def cmd_import(args: argparse.Namespace) -> None:
         print(f"File not found: {path}")
         return
     items = [] if args.replace else _load_items()
-    used_ids = {item.get("id") for item in items if isinstance(item.get("id"), int)}
+    by_id = _index_items(items)
     next_id = _next_id(items) if items else 1
     added = 0
     updated = 0
     skipped = 0
+    now = _now_iso()
 
     with open(path, "r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
@@ -1568,11 +1930,11 @@ def cmd_import(args: argparse.Namespace) -> None:
             created_at = row.get("created_at") or None
             updated_at = row.get("updated_at") or None
 
-            if item_id in used_ids:
+            if item_id in by_id:
                 if not args.update:
                     skipped += 1
                     continue
-                item = _get_item(items, item_id)
+                item = _get_item(items, item_id, by_id)
                 if not item:
                     skipped += 1
                     continue
@@ -1583,30 +1945,30 @@ def cmd_import(args: argparse.Namespace) -> None:
                 item["note"] = note
                 item["target_days"] = _clean_target_days(target_days)
                 if checkins:
-                    merged = _get_checkin_set(item).union(checkins)
-                    item["checkins"] = sorted(merged)
-                item["created_at"] = item.get("created_at") or created_at or _now_iso()
-                item["updated_at"] = updated_at or _now_iso()
+                    _set_checkins(item, _get_checkin_set(item).union(checkins))
+                item["created_at"] = item.get("created_at") or created_at or now
+                item["updated_at"] = updated_at or now
                 updated += 1
                 continue
 
-            if item_id is None or item_id in used_ids:
+            if item_id is None or item_id in by_id:
                 item_id = next_id
                 next_id += 1
-            used_ids.add(item_id)
             new_item = {
                 "id": item_id,
                 "title": title,
                 "done": done,
                 "done_at": done_at,
-                "created_at": created_at or _now_iso(),
-                "updated_at": updated_at or created_at or _now_iso(),
+                "created_at": created_at or now,
+                "updated_at": updated_at or created_at or now,
                 "goal_per_week": goal,
                 "note": note,
                 "target_days": _clean_target_days(target_days),
                 "checkins": checkins,
             }
-            items.append(_normalize_item(new_item))
+            new_item = _normalize_item(new_item)
+            items.append(new_item)
+            by_id[item_id] = new_item
             added += 1
 
     _save_items(items)
@@ -1617,7 +1979,47 @@ def cmd_import(args: argparse.Namespace) -> None:
         print(f"Skipped {skipped} row(s).")
 
 
+def cmd_batch(args: argparse.Namespace) -> None:
+    if args.file == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        path = os.path.expanduser(args.file)
+        if not os.path.exists(path):
+            print(f"File not found: {path}")
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    parser = _get_parser()
+    ran = 0
+    skipped = 0
+    with _batched_writes() as batch:
+        for line_no, line in enumerate(lines, start=1):
+            raw = line.strip()
+            if not raw or raw.startswith("#"):
+                continue
+            try:
+                line_args = parser.parse_args(shlex.split(raw))
+            except (SystemExit, ValueError):
+                print(f"Line {line_no}: could not parse command: {raw}")
+                skipped += 1
+                continue
+            if line_args.func is cmd_batch:
+                print(f"Line {line_no}: batch cannot be nested.")
+                skipped += 1
+                continue
+            line_args.func(line_args)
+            ran += 1
+    if batch["saved"]:
+        print(f"Ran {ran} command(s) with a single save.")
+    else:
+        print(f"Ran {ran} command(s); nothing to save.")
+    if skipped:
+        print(f"Skipped {skipped} line(s).")
+
+
 def build_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(description="Local-first habit tracker")
     sub = parser.add_subparsers(dest="command", required=True)
 
@@ -1648,15 +2050,15 @@ def build_parser() -> argparse.ArgumentParser:
 
     checkin = sub.add_parser("checkin", help="Record a check-in for a habit")
     checkin.add_argument("id", type=int, help="Habit id")
-    checkin.add_argument("--date", help="Override date (YYYY-MM-DD)")
-    checkin.add_argument("--start", help="Start date for range (YYYY-MM-DD)")
-    checkin.add_argument("--end", help="End date for range (YYYY-MM-DD)")
+    checkin.add_argument("--date", type=_date_arg, help="Override date (YYYY-MM-DD)")
+    checkin.add_argument("--start", type=_date_arg, help="Start date for range (YYYY-MM-DD)")
+    checkin.add_argument("--end", type=_date_arg, help="End date for range (YYYY-MM-DD)")
     checkin.set_defaults(func=cmd_checkin)
 
     checkin_all = sub.add_parser("checkin-all", help="Record check-ins for scheduled habits")
-    checkin_all.add_argument("--date", help="Override date (YYYY-MM-DD)")
-    checkin_all.add_argument("--start", help="Start date for range (YYYY-MM-DD)")
-    checkin_all.add_argument("--end", help="End date for range (YYYY-MM-DD)")
+    checkin_all.add_argument("--date", type=_date_arg, help="Override date (YYYY-MM-DD)")
+    checkin_all.add_argument("--start", type=_date_arg, help="Start date for range (YYYY-MM-DD)")
+    checkin_all.add_argument("--end", type=_date_arg, help="End date for range (YYYY-MM-DD)")
     checkin_all.add_argument(
         "--include-unscheduled",
         action="store_true",
@@ -1667,18 +2069,18 @@ def build_parser() -> argparse.ArgumentParser:
 
     uncheck = sub.add_parser("uncheck", help="Remove a check-in for a habit")
     uncheck.add_argument("id", type=int, help="Habit id")
-    uncheck.add_argument("--date", help="Override date (YYYY-MM-DD)")
-    uncheck.add_argument("--start", help="Start date for range (YYYY-MM-DD)")
-    uncheck.add_argument("--end", help="End date for range (YYYY-MM-DD)")
+    uncheck.add_argument("--date", type=_date_arg, help="Override date (YYYY-MM-DD)")
+    uncheck.add_argument("--start", type=_date_arg, help="Start date for range (YYYY-MM-DD)")
+    uncheck.add_argument("--end", type=_date_arg, help="End date for range (YYYY-MM-DD)")
     uncheck.set_defaults(func=cmd_uncheck)
 
     streak = sub.add_parser("streak", help="Show streak stats for a habit")
     streak.add_argument("id", type=int, help="Habit id")
-    streak.add_argument("--date", help="Override date (YYYY-MM-DD)")
+    streak.add_argument("--date", type=_date_arg, help="Override date (YYYY-MM-DD)")
     streak.set_defaults(func=cmd_streak)
 
     streaks = sub.add_parser("streaks", help="List streaks across habits")
-    streaks.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
+    streaks.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
     streaks.add_argument(
         "--sort",
         choices=["current", "longest", "title", "id"],
@@ -1694,19 +2096,19 @@ def build_parser() -> argparse.ArgumentParser:
 
     report = sub.add_parser("report", help="Weekly or custom habit summary")
     report.add_argument("--days", type=int, default=7, help="Number of days to include")
-    report.add_argument("--date", help="Override end date (YYYY-MM-DD)")
+    report.add_argument("--date", type=_date_arg, help="Override end date (YYYY-MM-DD)")
     report.add_argument("--all", action="store_true", help="Include completed habits")
     report.set_defaults(func=cmd_report)
 
     history = sub.add_parser("history", help="Show daily check-ins for a habit")
     history.add_argument("id", type=int, help="Habit id")
     history.add_argument("--days", type=int, default=14, help="Number of days to include")
-    history.add_argument("--date", help="Override end date (YYYY-MM-DD)")
+    history.add_argument("--date", type=_date_arg, help="Override end date (YYYY-MM-DD)")
     history.set_defaults(func=cmd_history)
 
     today = sub.add_parser("today", help="Show today's check-in status across habits")
-    today.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
-    today.add_argument("--week-start", choices=["mon", "tue", "wed", "thu", "fri", "sat", "sun"], default="mon")
+    today.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
+    today.add_argument("--week-start", choices=WEEKDAY_ORDER, default="mon")
     today.add_argument("--all", action="store_true", help="Include completed habits")
     today.set_defaults(func=cmd_today)
 
@@ -1717,56 +2119,56 @@ def build_parser() -> argparse.ArgumentParser:
     pull.set_defaults(func=cmd_pull)
 
     week = sub.add_parser("week", help="Weekly goal progress view")
-    week.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
-    week.add_argument("--week-start", choices=["mon", "tue", "wed", "thu", "fri", "sat", "sun"], default="mon")
+    week.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
+    week.add_argument("--week-start", choices=WEEKDAY_ORDER, default="mon")
     week.add_argument("--all", action="store_true", help="Include completed habits")
     week.set_defaults(func=cmd_week)
 
     nudge = sub.add_parser("nudge", help="Show habits that need attention")
     nudge.add_argument("--days", type=int, default=3, help="Days since last check-in to flag")
-    nudge.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
-    nudge.add_argument("--week-start", choices=["mon", "tue", "wed", "thu", "fri", "sat", "sun"], default="mon")
+    nudge.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
+    nudge.add_argument("--week-start", choices=WEEKDAY_ORDER, default="mon")
     nudge.add_argument("--all", action="store_true", help="Include completed habits")
     nudge.set_defaults(func=cmd_nudge)
 
     review = sub.add_parser("review", help="Review habit momentum across a window")
     review.add_argument("--days", type=int, default=30, help="Number of days to include")
     review.add_argument("--stale-days", type=int, default=3, help="Days since last check-in to flag")
-    review.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
-    review.add_argument("--week-start", choices=["mon", "tue", "wed", "thu", "fri", "sat", "sun"], default="mon")
+    review.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
+    review.add_argument("--week-start", choices=WEEKDAY_ORDER, default="mon")
     review.add_argument("--all", action="store_true", help="Include completed habits")
     review.set_defaults(func=cmd_review)
 
     coverage = sub.add_parser("coverage", help="Check schedule coverage across habits")
     coverage.add_argument("--days", type=int, default=14, help="Number of days to include")
-    coverage.add_argument("--date", help="Override end date (YYYY-MM-DD)")
+    coverage.add_argument("--date", type=_date_arg, help="Override end date (YYYY-MM-DD)")
     coverage.add_argument("--limit", type=int, default=4, help="Max missed dates to list per habit")
     coverage.add_argument("--all", action="store_true", help="Include completed habits")
     coverage.set_defaults(func=cmd_coverage)
 
     timeline = sub.add_parser("timeline", help="Show daily check-in coverage across habits")
     timeline.add_argument("--days", type=int, default=14, help="Number of days to include")
-    timeline.add_argument("--date", help="Override end date (YYYY-MM-DD)")
+    timeline.add_argument("--date", type=_date_arg, help="Override end date (YYYY-MM-DD)")
     timeline.add_argument("--limit", type=int, default=3, help="Max habit titles to list per day")
     timeline.add_argument("--all", action="store_true", help="Include completed habits")
     timeline.set_defaults(func=cmd_timeline)
 
     plan = sub.add_parser("plan", help="Plan upcoming scheduled habits")
     plan.add_argument("--days", type=int, default=7, help="Number of days to include")
-    plan.add_argument("--date", help="Override start date (YYYY-MM-DD)")
+    plan.add_argument("--date", type=_date_arg, help="Override start date (YYYY-MM-DD)")
     plan.add_argument("--limit", type=int, default=4, help="Max habit titles to list per day")
     plan.add_argument("--all", action="store_true", help="Include completed habits")
     plan.set_defaults(func=cmd_plan)
 
     momentum = sub.add_parser("momentum", help="Compare schedule adherence across windows")
     momentum.add_argument("--windows", default="7,30,90", help="Comma-separated day windows")
-    momentum.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
+    momentum.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
     momentum.add_argument("--all", action="store_true", help="Include completed habits")
     momentum.set_defaults(func=cmd_momentum)
 
     weekday = sub.add_parser("weekday", help="Show weekday patterns for habits")
     weekday.add_argument("--days", type=int, default=30, help="Number of days to include")
-    weekday.add_argument("--date", help="Override end date (YYYY-MM-DD)")
+    weekday.add_argument("--date", type=_date_arg, help="Override end date (YYYY-MM-DD)")
     weekday.add_argument("--all", action="store_true", help="Include completed habits")
     weekday.set_defaults(func=cmd_weekday)
 
@@ -1791,8 +2193,8 @@ def build_parser() -> argparse.ArgumentParser:
     month = sub.add_parser("month", help="Show a monthly calendar view for a habit")
     month.add_argument("id", type=int, help="Habit id")
     month.add_argument("--month", help="Override month (YYYY-MM)")
-    month.add_argument("--date", help="Override reference date (YYYY-MM-DD)")
-    month.add_argument("--week-start", choices=["mon", "tue", "wed", "thu", "fri", "sat", "sun"], default="mon")
+    month.add_argument("--date", type=_date_arg, help="Override reference date (YYYY-MM-DD)")
+    month.add_argument("--week-start", choices=WEEKDAY_ORDER, default="mon")
     month.set_defaults(func=cmd_month)
 
     export_cmd = sub.add_parser("export", help="Export habits to CSV")
@@ -1805,13 +2207,41 @@ def build_parser() -> argparse.ArgumentParser:
     import_cmd.add_argument("--replace", action="store_true", help="Replace local habits before import")
     import_cmd.set_defaults(func=cmd_import)
 
+    batch = sub.add_parser("batch", help="Run many commands with a single load and save")
+    batch.add_argument("--file", default="-", help="File with one command per line (- for stdin)")
+    batch.set_defaults(func=cmd_batch)
+
     return parser
 
 
+@lru_cache(maxsize=None)
+def _get_parser() -> argparse.ArgumentParser:
+    return build_parser()
+
+
+def _fast_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    if argv == ["list"]:
+        return SimpleNamespace(command="list", all=False, func=cmd_list)
+    if argv == ["stats"]:
+        return SimpleNamespace(command="stats", func=cmd_stats)
+    if len(argv) != 2 or argv[1].startswith("-"):
+        return None
+    command, value = argv
+    if command == "add":
+        return SimpleNamespace(command="add", title=value, func=cmd_add)
+    if command == "checkin" and value.isascii() and value.isdigit():
+        return SimpleNamespace(
+            command="checkin", id=int(value), date=None, start=None, end=None, func=cmd_checkin
+        )
+    return None
+
+
 def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
+    args = _fast_args(sys.argv[1:])
+    if args is None:
+        args = _get_parser().parse_args()
     args.func(args)
+    _flush_sidecar()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import unittest
+from datetime import date
+
+import habit
+
+
+class CheckinMaskTests(unittest.TestCase):
+    def test_mask_range_count(self):
+        checkins = {"2026-02-01", "2026-02-03", "2026-02-04", "2026-02-10"}
+        base, mask = habit._ordinal_mask(habit._normalize_checkins(checkins))
+        start = date(2026, 2, 1).toordinal()
+
+        self.assertEqual(base, start)
+        self.assertEqual(habit._mask_range_count(base, mask, start, start + 6), 3)
+        self.assertEqual(habit._mask_range_count(base, mask, start + 2, start + 9), 3)
+        self.assertEqual(habit._mask_range_count(base, mask, start - 5, start), 1)
+        self.assertEqual(habit._mask_range_count(base, mask, start + 10, start + 20), 0)
+        self.assertEqual(habit._mask_range_count(base, mask, start - 9, start - 1), 0)
+
+    def test_unparseable_checkins_are_skipped(self):
+        item = habit._normalize_item({"checkins": ["2026-02-01", "garbage", "2026-13-01"]})
+
+        self.assertEqual(habit._get_checkin_ordinals(item), {date(2026, 2, 1).toordinal()})
+        self.assertEqual(habit._last_checkin_date(item), date(2026, 2, 1))
+        self.assertEqual(habit._normalize_checkins(["garbage"]), frozenset())
+
+    def test_non_padded_dates_are_accepted(self):
+        self.assertEqual(habit._parse_date("2026-2-4"), date(2026, 2, 4))
+        self.assertEqual(
+            habit._parse_checkins("2026-2-1; 2026-02-03; bogus"), ["2026-02-01", "2026-02-03"]
+        )
+        self.assertEqual(
+            habit._normalize_checkins(["2026-2-1", "2026-02-01"]), {date(2026, 2, 1).toordinal()}
+        )
+
+    def test_mask_empty(self):
+        self.assertEqual(habit._ordinal_mask(frozenset()), (0, 0))
+        self.assertEqual(habit._mask_range_count(0, 0, 10, 20), 0)
+
+
+class AddCheckinsTests(unittest.TestCase):
+    def test_normalize_sorts_and_dedupes(self):
+        item = habit._normalize_item({"checkins": ["2026-02-03", "2026-02-01", 5, "2026-02-01"]})
+        self.assertEqual(item["checkins"], ["2026-02-01", "2026-02-03"])
+
+    def test_normalize_skips_already_normalized_items(self):
+        item = habit._normalize_item({"checkins": ["2026-02-01"], "note": 5})
+        self.assertIsNone(item["note"])
+        self.assertEqual(
+            habit._storable_items([item]),
+            [{"checkins": ["2026-02-01"], "note": None, "tags": []}],
+        )
+
+        item["tags"] = "not-a-list"
+        self.assertEqual(habit._normalize_item(item)["tags"], "not-a-list")
+
+    def test_add_checkins_keeps_list_sorted(self):
+        item = habit._normalize_item({"checkins": ["2026-02-01", "2026-02-05"]})
+        self.assertEqual(habit._get_checkin_set(item), {"2026-02-01", "2026-02-05"})
+
+        self.assertEqual(habit._add_checkins(item, ["2026-02-03"]), ["2026-02-03"])
+        self.assertEqual(
+            habit._add_checkins(item, ["2026-02-06", "2026-02-01", "2026-02-02"]),
+            ["2026-02-02", "2026-02-06"],
+        )
+        self.assertEqual(habit._add_checkins(item, ["2026-02-05"]), [])
+        self.assertEqual(
+            item["checkins"],
+            ["2026-02-01", "2026-02-02", "2026-02-03", "2026-02-05", "2026-02-06"],
+        )
+        self.assertEqual(len(habit._get_checkin_set(item)), 5)
+
+    def test_remove_checkins_keeps_list_sorted(self):
+        item = habit._normalize_item({"checkins": ["2026-02-01", "2026-02-03", "2026-02-05"]})
+        self.assertEqual(habit._get_checkin_set(item), {"2026-02-01", "2026-02-03", "2026-02-05"})
+
+        self.assertEqual(
+            habit._remove_checkins(item, ["2026-02-05", "2026-02-04", "2026-02-01"]),
+            ["2026-02-01", "2026-02-05"],
+        )
+        self.assertEqual(habit._remove_checkins(item, ["2026-02-02"]), [])
+        self.assertEqual(item["checkins"], ["2026-02-03"])
+        self.assertEqual(habit._get_checkin_set(item), {"2026-02-03"})
+
+
+if __name__ == "__main__":
+    unittest.main()
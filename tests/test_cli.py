@@ -0,0 +1,28 @@
+import unittest
+
+import habit
+
+
+class FastArgsTests(unittest.TestCase):
+    def test_fast_args_match_parser(self):
+        parser = habit.build_parser()
+        for argv in (["list"], ["stats"], ["add", "Read daily"], ["checkin", "12"]):
+            with self.subTest(argv=argv):
+                fast = habit._fast_args(argv)
+                self.assertIsNotNone(fast)
+                self.assertEqual(vars(fast), vars(parser.parse_args(argv)))
+
+    def test_fast_args_defer_to_parser(self):
+        cases = (
+            ["list", "--all"],
+            ["add", "-h"],
+            ["checkin", "x"],
+            ["checkin", "3", "--date", "2026-02-01"],
+        )
+        for argv in cases:
+            with self.subTest(argv=argv):
+                self.assertIsNone(habit._fast_args(argv))
+
+
+if __name__ == "__main__":
+    unittest.main()
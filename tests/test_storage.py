@@ -0,0 +1,191 @@
+import io
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import habit
+
+
+class StorageTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.original_path = habit.DATA_PATH
+        habit.DATA_PATH = os.path.join(self.tmpdir.name, "habits.json")
+        self.addCleanup(setattr, habit, "DATA_PATH", self.original_path)
+        habit._CACHE.update(key=None, items=None, pending=None)
+
+    def _write(self, items):
+        with open(habit.DATA_PATH, "w", encoding="utf-8") as f:
+            json.dump(items, f)
+
+    def test_load_missing_file(self):
+        self.assertEqual(habit._load_items(), [])
+
+    def test_load_cache_returns_independent_copies(self):
+        self._write([{"id": 1, "title": "Read", "checkins": ["2026-02-01"]}])
+        first = habit._load_items()
+        first[0]["title"] = "Changed"
+        first[0]["checkins"].append("2026-02-02")
+
+        second = habit._load_items()
+        self.assertEqual(second[0]["title"], "Read")
+        self.assertEqual(second[0]["checkins"], ["2026-02-01"])
+
+    def test_save_invalidates_cache(self):
+        self._write([{"id": 1, "title": "Read", "checkins": []}])
+        items = habit._load_items()
+        items[0]["title"] = "Write"
+        habit._save_items(items)
+
+        self.assertEqual(habit._load_items()[0]["title"], "Write")
+
+    def test_save_replaces_file_without_leftovers(self):
+        habit._save_items([{"id": 1, "title": "Read", "checkins": []}])
+        habit._save_items([{"id": 2, "title": "Walk", "checkins": []}])
+
+        self.assertEqual(os.listdir(self.tmpdir.name), ["habits.json"])
+        self.assertEqual([item["id"] for item in habit._load_items()], [2])
+
+    def test_failed_save_keeps_file_and_removes_tmp(self):
+        habit._save_items([{"id": 1, "title": "Read", "checkins": []}])
+        original_fsync = habit.os.fsync
+
+        def failing_fsync(fd):
+            raise OSError("disk full")
+
+        habit.os.fsync = failing_fsync
+        self.addCleanup(setattr, habit.os, "fsync", original_fsync)
+        with self.assertRaises(OSError):
+            habit._save_items([{"id": 2, "title": "Walk", "checkins": []}])
+
+        self.assertEqual(os.listdir(self.tmpdir.name), ["habits.json"])
+        self.assertEqual([item["id"] for item in habit._load_items()], [1])
+
+    def test_sidecar_serves_unchanged_file(self):
+        self._write([{"id": 1, "title": "Read", "checkins": ["2026-02-01"]}])
+        habit._load_items()
+        self.assertFalse(os.path.exists(habit.DATA_PATH + ".cache"))
+        habit._flush_sidecar()
+        self.assertTrue(os.path.exists(habit.DATA_PATH + ".cache"))
+
+        habit._CACHE.update(key=None, items=None)
+        original_loads = habit._json_loads
+
+        def fail_loads(raw):
+            raise AssertionError("JSON should not be parsed")
+
+        habit._json_loads = fail_loads
+        self.addCleanup(setattr, habit, "_json_loads", original_loads)
+        self.assertEqual(habit._load_items()[0]["checkins"], ["2026-02-01"])
+
+    def test_save_drops_sidecar_and_skips_pending_write(self):
+        self._write([{"id": 1, "title": "Read", "checkins": []}])
+        items = habit._load_items()
+        items[0]["title"] = "Write"
+        habit._save_items(items)
+        habit._flush_sidecar()
+        self.assertEqual(os.listdir(self.tmpdir.name), ["habits.json"])
+
+        self.assertEqual(habit._load_items()[0]["title"], "Write")
+        habit._flush_sidecar()
+        self.assertTrue(os.path.exists(habit.DATA_PATH + ".cache"))
+        habit._save_items(habit._load_items())
+        self.assertEqual(os.listdir(self.tmpdir.name), ["habits.json"])
+
+    def test_sidecar_from_other_version_is_ignored(self):
+        self._write([{"id": 1, "title": "Read", "checkins": []}])
+        st = os.stat(habit.DATA_PATH)
+        with open(habit.DATA_PATH + ".cache", "wb") as f:
+            pickle.dump({"mtime_ns": st.st_mtime_ns, "size": st.st_size}, f)
+            pickle.dump([{"id": 1, "title": "Stale", "checkins": []}], f)
+
+        self.assertEqual(habit._load_items()[0]["title"], "Read")
+
+    def test_checkin_set_memo_is_stripped_and_invalidated(self):
+        item = {"id": 1, "title": "Read", "checkins": ["2026-02-01"]}
+        self.assertEqual(habit._get_checkin_set(item), {"2026-02-01"})
+        habit._set_checkins(item, {"2026-02-01", "2026-02-02"})
+        self.assertEqual(habit._get_checkin_set(item), {"2026-02-01", "2026-02-02"})
+
+        habit._save_items([item])
+        with open(habit.DATA_PATH, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        self.assertNotIn("_checkin_set", stored[0])
+        self.assertEqual(stored[0]["checkins"], ["2026-02-01", "2026-02-02"])
+
+    def test_batch_applies_commands_with_one_save(self):
+        script = os.path.join(self.tmpdir.name, "commands.txt")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write('# morning\nadd "Read"\nadd Walk\n\ncheckin 1 --date 2026-02-01\nbogus\n')
+        saves = []
+        original_save = habit._save_items
+
+        def counting_save(items):
+            if not habit._BATCH["active"]:
+                saves.append(len(items))
+            original_save(items)
+
+        habit._save_items = counting_save
+        self.addCleanup(setattr, habit, "_save_items", original_save)
+        args = habit.build_parser().parse_args(["batch", "--file", script])
+        out = io.StringIO()
+        with redirect_stdout(out), redirect_stderr(io.StringIO()):
+            args.func(args)
+
+        self.assertEqual(saves, [2])
+        items = habit._load_items()
+        self.assertEqual([item["title"] for item in items], ["Read", "Walk"])
+        self.assertEqual(items[0]["checkins"], ["2026-02-01"])
+        self.assertIn("Skipped 1 line(s).", out.getvalue())
+        self.assertFalse(habit._BATCH["active"])
+
+    def test_read_only_batch_reports_no_save(self):
+        self._write([{"id": 1, "title": "Read", "checkins": []}])
+        before = os.stat(habit.DATA_PATH).st_mtime_ns
+        script = os.path.join(self.tmpdir.name, "commands.txt")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write("list\nhistory 1 --date 2026-02-07\n")
+        args = habit.build_parser().parse_args(["batch", "--file", script])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            args.func(args)
+
+        self.assertIn("Ran 2 command(s); nothing to save.", out.getvalue())
+        self.assertEqual(os.stat(habit.DATA_PATH).st_mtime_ns, before)
+
+    def test_timeline_skips_malformed_keys(self):
+        self._write(
+            [{"id": 1, "title": "Read", "checkins": ["2026-02-01", "2026-02-01x", "2026-2-1"]}]
+        )
+        args = habit.build_parser().parse_args(["timeline", "--date", "2026-02-20", "--days", "20"])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            args.func(args)
+
+        self.assertIn("2026-02-01 | 1/1 (100%) | Read", out.getvalue())
+        self.assertIn("Overall check-ins: 1/20 (5%)", out.getvalue())
+
+    def test_same_value_updates_skip_save(self):
+        habit._save_items(
+            [{"id": 1, "title": "Read", "checkins": [], "goal_per_week": 3, "note": None}]
+        )
+        before = os.stat(habit.DATA_PATH).st_mtime_ns
+        parser = habit.build_parser()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            for argv in (["goal", "1", "3"], ["note", "1", "--clear"], ["schedule", "1", "--clear"]):
+                args = parser.parse_args(argv)
+                args.func(args)
+
+        self.assertEqual(os.stat(habit.DATA_PATH).st_mtime_ns, before)
+        self.assertIn("already has a goal of 3/week", out.getvalue())
+        self.assertIn("has no note set", out.getvalue())
+        self.assertIn("has no schedule set", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,6 +22,22 @@ class StreakHelpersTests(unittest.TestCase):
         self.assertEqual(row["last_date"], date(2026, 2, 7))
         self.assertEqual(row["days_since"], 0)
 
+    def _streaks(self, checkins, today):
+        return habit._item_streaks({"checkins": sorted(checkins)}, today.toordinal())
+
+    def test_item_streaks_runs_and_current(self):
+        checkins = {"2026-01-30", "2026-01-31", "2026-02-01", "2026-02-02", "2026-02-06", "2026-02-07"}
+
+        self.assertEqual(self._streaks(checkins, date(2026, 2, 7)), {"current": 2, "longest": 4})
+        self.assertEqual(self._streaks(checkins, date(2026, 2, 5)), {"current": 0, "longest": 4})
+        self.assertEqual(self._streaks(set(), date(2026, 2, 7)), {"current": 0, "longest": 0})
+
+    def test_item_streaks_ignores_later_checkins_for_current(self):
+        checkins = {"2026-02-01", "2026-02-02", "2026-02-03", "2026-02-04"}
+
+        self.assertEqual(self._streaks(checkins, date(2026, 2, 2)), {"current": 2, "longest": 4})
+        self.assertEqual(self._streaks(checkins, date(2026, 1, 20)), {"current": 0, "longest": 4})
+
     def test_streak_sort_key_modes(self):
         rows = [
             {"id": 2, "title": "Beta", "current": 1, "longest": 4},
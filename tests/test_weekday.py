@@ -5,41 +5,60 @@ import habit
 
 
 class WeekdaySummaryTests(unittest.TestCase):
-    def test_weekday_summary_with_schedule(self):
-        end_date = date(2026, 2, 7)
-        window = habit._window_dates(end_date, 7)
-        checkins = {"2026-02-01", "2026-02-03"}
-        target_days = ["mon", "wed", "fri"]
-
-        actual, expected, total_actual, total_expected = habit._weekday_summary(
-            window, checkins, target_days
-        )
+    @classmethod
+    def setUpClass(cls):
+        cls.start_ord = date(2026, 2, 1).toordinal()
+
+    def _summary(self, checkins, target_days):
+        base, mask = habit._ordinal_mask(habit._normalize_checkins(checkins))
+        window_mask = habit._window_mask(base, mask, self.start_ord, 7)
+        return habit._weekday_summary_mask(self.start_ord, 7, window_mask, target_days)
+
+    def test_weekday_summary(self):
+        with self.subTest(kind="scheduled"):
+            actual, expected, total_actual, total_expected = self._summary(
+                ["2026-02-01", "2026-02-03"], ["mon", "wed", "fri"]
+            )
+
+            self.assertEqual(total_actual, 2)
+            self.assertEqual(total_expected, 3)
+            self.assertEqual(actual.sun, 1)
+            self.assertEqual(actual.tue, 1)
+            self.assertEqual(expected.mon, 1)
+            self.assertEqual(expected.wed, 1)
+            self.assertEqual(expected.fri, 1)
+            self.assertEqual(expected.sun, 0)
 
-        self.assertEqual(total_actual, 2)
-        self.assertEqual(total_expected, 3)
-        self.assertEqual(actual["sun"], 1)
-        self.assertEqual(actual["tue"], 1)
-        self.assertEqual(expected["mon"], 1)
-        self.assertEqual(expected["wed"], 1)
-        self.assertEqual(expected["fri"], 1)
-        self.assertEqual(expected["sun"], 0)
-
-    def test_weekday_summary_without_schedule(self):
-        end_date = date(2026, 2, 7)
-        window = habit._window_dates(end_date, 7)
-        checkins = {"2026-02-02", "2026-02-04", "2026-02-06"}
-
-        actual, expected, total_actual, total_expected = habit._weekday_summary(
-            window, checkins, []
+        with self.subTest(kind="unscheduled"):
+            actual, expected, total_actual, total_expected = self._summary(
+                ["2026-02-02", "2026-02-04", "2026-02-06"], []
+            )
+
+            self.assertEqual(total_actual, 3)
+            self.assertEqual(total_expected, 7)
+            self.assertEqual(actual.mon, 1)
+            self.assertEqual(actual.wed, 1)
+            self.assertEqual(actual.fri, 1)
+            self.assertEqual(expected.mon, 1)
+            self.assertEqual(expected.sun, 1)
+
+    def test_weekday_summary_mask_with_schedule(self):
+        checkins_mask = 0b101
+
+        actual, expected, total_actual, total_expected = habit._weekday_summary_mask(
+            self.start_ord, 7, checkins_mask, ["mon", "wed", "fri"]
         )
 
-        self.assertEqual(total_actual, 3)
-        self.assertEqual(total_expected, 7)
-        self.assertEqual(actual["mon"], 1)
-        self.assertEqual(actual["wed"], 1)
-        self.assertEqual(actual["fri"], 1)
-        self.assertEqual(expected["mon"], 1)
-        self.assertEqual(expected["sun"], 1)
+        self.assertEqual((total_actual, total_expected), (2, 3))
+        self.assertEqual(actual.sun, 1)
+        self.assertEqual(actual.tue, 1)
+        self.assertEqual(expected, habit.WeekdayCounts(1, 0, 1, 0, 1, 0, 0))
+        self.assertEqual(expected["wed"], expected.wed)
+
+    def test_schedule_mask(self):
+        self.assertEqual(habit._schedule_mask(["mon", "wed", "fri"]), 0b0010101)
+        self.assertEqual(habit._schedule_mask([]), 0x7F)
+        self.assertEqual(habit._schedule_mask(["sun", "bogus"]), 0b1000000)
 
 
 if __name__ == "__main__":